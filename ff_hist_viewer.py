@@ -2,7 +2,19 @@
 
 import argparse
 import sqlite3
+import struct
 import sys
+import zipfile
+from datetime import datetime, timezone
+from urllib.parse import urlsplit
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Microseconds per timeline bucket (one hour)
+HOUR_USEC = 3_600_000_000
 
 """ Windows Location """
 # C:\Users\<username>\AppData\Roaming\Mozilla\Firefox\Profiles\xxxxxxxx.default\places.sqlite
@@ -54,17 +66,172 @@ def history(db: str) -> None:
         sys.exit(f"{tc.warning} Error reading database. {err}")
 
 
+def require_numpy() -> None:
+    """Exit if NumPy is not available for the columnar store."""
+    if np is None:
+        sys.exit("numpy module required for export/timeline: pip install numpy")
+
+
+def export(db: str, out: str) -> None:
+    """
+    Export Firefox history visits to a columnar NumPy store with domain and hourly aggregates.
+    A ".npz" suffix is added to out if missing.
+    """
+    require_numpy()
+    tc = Termcolors()
+    try:
+        conn = sqlite3.connect(db)
+        places = conn.execute("SELECT id, url FROM moz_places WHERE visit_count >= 0 ORDER BY id;").fetchall()
+        visits = conn.execute(
+            "SELECT place_id, visit_date FROM moz_historyvisits "
+            "WHERE place_id IS NOT NULL AND visit_date IS NOT NULL ORDER BY visit_date;"
+        ).fetchall()
+        conn.close()
+    except Exception as err:
+        sys.exit(f"{tc.warning} Error reading database. {err}")
+
+    # Parse each place's host once, not once per visit
+    hosts = {}
+    place_ids = np.fromiter((row[0] for row in places), dtype=np.int64, count=len(places))
+    place_host = np.empty(len(places), dtype=np.int32)
+    for i, (_, url) in enumerate(places):
+        try:
+            host = urlsplit(url or "").hostname or ""
+        except ValueError:
+            host = ""
+        place_host[i] = hosts.setdefault(host, len(hosts))
+
+    visit_place = np.fromiter((row[0] for row in visits), dtype=np.int64, count=len(visits))
+    visit_date = np.fromiter((row[1] for row in visits), dtype=np.int64, count=len(visits))
+
+    # Drop visits whose place is missing, matching the join used by history()
+    pos = np.searchsorted(place_ids, visit_place)
+    pos[pos == len(place_ids)] = 0
+    known = place_ids[pos] == visit_place if len(place_ids) else np.zeros(len(visit_place), dtype=bool)
+    visit_place, visit_date = visit_place[known], visit_date[known]
+
+    # Keep only hosts that still have visits, renumbered densely
+    host_names = np.array(list(hosts), dtype=str)
+    used_hosts, visit_host = np.unique(place_host[pos[known]], return_inverse=True)
+    hosts = host_names[used_hosts]
+    visit_host = visit_host.reshape(-1).astype(np.int32)
+
+    visit_hour = visit_date // HOUR_USEC
+    hour, hour_counts = np.unique(visit_hour, return_counts=True)
+
+    # Per-host hour buckets sorted by (host, hour); host i owns host_hour[host_offsets[i]:host_offsets[i + 1]]
+    order = np.lexsort((visit_hour, visit_host))
+    sorted_host, sorted_hour = visit_host[order], visit_hour[order]
+    if len(order):
+        boundary = (sorted_host[1:] != sorted_host[:-1]) | (sorted_hour[1:] != sorted_hour[:-1])
+        starts = np.flatnonzero(np.concatenate(([True], boundary)))
+    else:
+        starts = np.empty(0, dtype=np.int64)
+    host_hour = sorted_hour[starts]
+    host_hour_counts = np.diff(np.append(starts, len(order))).astype(np.int32)
+    host_offsets = np.searchsorted(sorted_host[starts], np.arange(len(hosts) + 1))
+
+    if not out.endswith(".npz"):
+        out = f"{out}.npz"
+    # Stored uncompressed so timeline() can memory-map members instead of inflating them
+    np.savez(
+        out,
+        visit_date=visit_date,
+        place_id=visit_place,
+        host_id=visit_host,
+        hosts=hosts,
+        host_counts=np.bincount(visit_host, minlength=len(hosts)),
+        hour=hour,
+        hour_counts=hour_counts,
+        host_hour=host_hour,
+        host_hour_counts=host_hour_counts,
+        host_offsets=host_offsets,
+    )
+    print(f"{tc.arrow} Exported {len(visit_date)} visits across {len(hosts)} hosts to {out}")
+
+
+def load_member(store: str, name: str):
+    """Memory-map a single uncompressed array from an exported .npz store."""
+    with zipfile.ZipFile(store) as zf:
+        info = zf.getinfo(f"{name}.npy")
+    if info.compress_type != zipfile.ZIP_STORED:
+        raise ValueError(f"{name} is compressed")
+    with open(store, "rb") as f:
+        # Skip the zip local file header to reach the .npy payload
+        f.seek(info.header_offset + 26)
+        name_len, extra_len = struct.unpack("<HH", f.read(4))
+        f.seek(name_len + extra_len, 1)
+        if np.lib.format.read_magic(f) != (1, 0):
+            raise ValueError(f"{name} has an unsupported .npy version")
+        shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+        offset = f.tell()
+    if dtype.hasobject or fortran_order:
+        raise ValueError(f"{name} cannot be memory-mapped")
+    if not np.prod(shape):
+        return np.empty(shape, dtype=dtype)
+    return np.memmap(store, dtype=dtype, mode="r", offset=offset, shape=shape)
+
+
+def timeline(store: str, domain: str = None, top: int = 20) -> None:
+    """Print top domains and hourly visit counts from an exported store."""
+    require_numpy()
+    tc = Termcolors()
+    try:
+        # Members are memory-mapped, so only the pages actually sliced are read
+        hosts = load_member(store, "hosts")
+        if domain:
+            domain = domain.lower()
+            matches = np.flatnonzero(hosts == domain)
+            if not matches.size:
+                sys.exit(f"{tc.warning} No visits for {domain}")
+            start, end = load_member(store, "host_offsets")[matches[0] : matches[0] + 2]
+            hour = load_member(store, "host_hour")[start:end]
+            hour_counts = load_member(store, "host_hour_counts")[start:end]
+        else:
+            host_counts = load_member(store, "host_counts")
+            hour, hour_counts = load_member(store, "hour"), load_member(store, "hour_counts")
+    except OSError as err:
+        sys.exit(f"{tc.warning} Error reading store. {err}")
+    except (KeyError, ValueError, zipfile.BadZipFile):
+        sys.exit(f"{tc.warning} Error reading store. {store} is not an exported history store.")
+
+    if not domain:
+        print(f"{tc.yellow}\n[ Top Domains ]{tc.reset}")
+        for i in np.argsort(host_counts, kind="stable")[::-1][:top]:
+            print(f"{tc.arrow} {host_counts[i]}: {hosts[i] or '(none)'}")
+
+    print(f"{tc.yellow}\n[ Visits per Hour ]{tc.reset}")
+    for bucket, count in zip(hour.tolist(), hour_counts.tolist()):
+        try:
+            date = datetime.fromtimestamp(bucket * 3600, tz=timezone.utc).strftime("%Y-%m-%d %H:00")
+        except (ValueError, OverflowError, OSError):
+            # Corrupt or out-of-range visit_date; show the raw hour bucket instead
+            date = f"hour {bucket}"
+        print(f"{tc.arrow} {date}: {count}")
+
+
 def main() -> None:
     """Main function."""
     parser = argparse.ArgumentParser("Firefox History & Bookmarks Viewer")
-    parser.add_argument("file", help="Firefox sqlite file path")
+    parser.add_argument("file", help="Firefox sqlite file path (or .npz store with --timeline)")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--export", metavar="NPZ", help="export history to a columnar NumPy store (.npz added if missing)")
+    mode.add_argument("--timeline", action="store_true", help="print aggregates from an exported store")
+    parser.add_argument("--domain", help="limit --timeline hourly counts to an exact host match, e.g. www.example.com")
+    parser.add_argument("--top", type=int, help="number of domains shown by --timeline (default: 20)")
     args = parser.parse_args()
+    if not args.timeline and (args.domain is not None or args.top is not None):
+        parser.error("--domain and --top require --timeline")
     places = args.file
 
-    if places:
-        history(places)
-    else:
+    if not places:
         sys.exit("Missing path to SQLite database.")
+    elif args.timeline:
+        timeline(places, args.domain, 20 if args.top is None else args.top)
+    elif args.export:
+        export(places, args.export)
+    else:
+        history(places)
 
 
 if __name__ == "__main__":
@@ -1,38 +1,64 @@
 import argparse
+import io
 import os
+import time
 import zipfile
 from typing import Callable
 
+from scan_metrics import Metrics, add_arguments, metrics_path
 
-def is_zip_file(file_path: str):
+
+class CountingFile(io.FileIO):
+    """Raw file that keeps a running total of the bytes returned by read()."""
+
+    bytes_read = 0
+
+    def read(self, size=-1):
+        data = super().read(size)
+        self.bytes_read += len(data)
+        return data
+
+
+def is_zip_file(file_path: str, metrics: Metrics = None):
     """
     If the first four bytes of the file are the ASCII characters "PK" followed by the two bytes
     "\x03\x04", then the file is a zip file.
 
     :param file_path: The path to the file you want to check
     :type file_path: str
+    :param metrics: Optional metrics collector for bytes read
+    :type metrics: Metrics
     :return: The return value is a boolean.
     """
     with open(file_path, "rb") as f:
         header = f.read(4)
-        return header == b"\x50\x4B\x03\x04"
+    if metrics:
+        metrics.count("bytes_read", len(header))
+    return header == b"\x50\x4B\x03\x04"
 
 
-def extract_file_contents(file_path: str):
+def extract_file_contents(file_path: str, metrics: Metrics = None):
     """
     If the file is a zip file and contains a file named "[Content_Types].xml", then return "MS Office file",
     otherwise return "Zip file".
 
     :param file_path: The path to the file you want to extract the contents of
     :type file_path: str
+    :param metrics: Optional metrics collector for bytes read
+    :type metrics: Metrics
     :return: A string
     """
-    if not is_zip_file(file_path):
+    if not is_zip_file(file_path, metrics):
         return None
 
-    with zipfile.ZipFile(file_path) as zf:
-        files = zf.namelist()
-        return "MS Office file" if "[Content_Types].xml" in files else "Zip file"
+    with CountingFile(file_path) as f:
+        try:
+            with zipfile.ZipFile(f) as zf:
+                files = zf.namelist()
+        finally:
+            if metrics:
+                metrics.count("bytes_read", f.bytes_read)
+    return "MS Office file" if "[Content_Types].xml" in files else "Zip file"
 
 
 def decorator(func: Callable):
@@ -65,11 +91,12 @@ def func(name: str, files: str):
     print(f"{name}: {len(files)} files")
 
 
-def determine_file_type(file_path: str):
+def determine_file_type(file_path: str, metrics: Metrics = None):
     """
     Returns the file type of the file whose data is passed in as an argument
 
     :param data: The data to be checked
+    :param metrics: Optional metrics collector for bytes read
     :return: The file type of the file.
 
     https://en.wikipedia.org/wiki/List_of_file_signatures
@@ -139,6 +166,8 @@ def determine_file_type(file_path: str):
     try:
         with open(file_path, "rb") as f:
             file_bytes = f.read(20)  # Read the first 20 bytes of the file
+            if metrics:
+                metrics.count("bytes_read", len(file_bytes))
             return next(
                 (
                     file_type
@@ -169,18 +198,32 @@ def scantree(directory: str):
                 continue
 
 
-def scan_directory_for_file_types(directory: str):
+def scan_directory_for_file_types(directory: str, metrics: Metrics = None):
     """
     Scans a directory for files, and returns a dictionary of file types and the files that match that
     file type.
 
     :param directory: The directory to scan
     :type directory: str
+    :param metrics: Optional metrics collector for walk and signature timings
+    :type metrics: Metrics
     :return: A dictionary of file types and a list of file paths.
     """
+    if metrics is None:
+        metrics = Metrics("file_offsets")
     file_types = {}
-    for file_path in scantree(directory):
-        if file_type := determine_file_type(str(file_path)):
+    files = scantree(directory)
+    while True:
+        start = time.perf_counter()
+        file_path = next(files, None)
+        metrics.add_time("scantree", time.perf_counter() - start)
+        if file_path is None:
+            break
+        metrics.count("files")
+        with metrics.stage("determine_file_type"):
+            file_type = determine_file_type(str(file_path), metrics)
+        if file_type:
+            metrics.count(f"file_types.{file_type}")
             if file_type not in file_types:
                 file_types[file_type] = []
             file_types[file_type].append(file_path)
@@ -195,6 +238,7 @@ def parser():
     """
     parse = argparse.ArgumentParser(description="Determine file types in a directory")
     parse.add_argument("PATH", help="Directory path to scan")
+    add_arguments(parse)
     return parse
 
 
@@ -204,15 +248,27 @@ def main():
     that are associated with them.
     """
     args = parser().parse_args()
-    file_types = scan_directory_for_file_types(args.PATH)
-    ext = ".docx", ".xlsx", ".pptx"
-    for file_type, files in file_types.items():
-        func(file_type, files)
-        for file in files:
-            if file.endswith(ext):
-                print(f"  - {file} (\u001b[32m{extract_file_contents(file)}\u001b[0m)")
-            else:
-                print(f"  - {file}")
+    metrics = Metrics("file_offsets", profile=args.profile, trace_memory=args.trace_memory)
+    metrics.start()
+    try:
+        file_types = scan_directory_for_file_types(args.PATH, metrics)
+        ext = ".docx", ".xlsx", ".pptx"
+        for file_type, files in file_types.items():
+            with metrics.stage("output"):
+                func(file_type, files)
+            for file in files:
+                if file.endswith(ext):
+                    with metrics.stage("zip_inspection"):
+                        contents = extract_file_contents(file, metrics)
+                    with metrics.stage("output"):
+                        print(f"  - {file} (\u001b[32m{contents}\u001b[0m)")
+                else:
+                    with metrics.stage("output"):
+                        print(f"  - {file}")
+    finally:
+        metrics.stop()
+        if path := metrics_path(args, "file_offsets"):
+            metrics.dump(path)
 
 
 if __name__ == "__main__":
@@ -4,11 +4,15 @@ __author__ = "DFIRSec (@pulsecode)"
 __version__ = "v0.0.1"
 __description__ = "IOC Extractor"
 
+import argparse
 import json
 import re
 import sys
+import time
 from pathlib import Path
 
+from scan_metrics import Metrics, add_arguments, metrics_path
+
 
 class RegexHelper:
     @staticmethod
@@ -36,16 +40,24 @@ class RegexHelper:
     def regex_iter(regex, text):
         return [x.group() for x in re.finditer(regex, text.lower())]
 
-    def regex_patterns(self, text):
-        patterns = {
-            "Domain": self.regex_iter(self.regex(_type="domain"), text),
-            "Email": self.regex_iter(self.regex(_type="email"), text),
-            "IPV4": self.regex_iter(self.regex(_type="ipv4"), text),
-            "MD5": self.regex_iter(self.regex(_type="md5"), text),
-            "SHA1": self.regex_iter(self.regex(_type="sha1"), text),
-            "SHA256": self.regex_iter(self.regex(_type="sha256"), text),
-            "URL": self.regex_iter(self.regex(_type="url"), text),
-        }
+    types = {
+        "Domain": "domain",
+        "Email": "email",
+        "IPV4": "ipv4",
+        "MD5": "md5",
+        "SHA1": "sha1",
+        "SHA256": "sha256",
+        "URL": "url",
+    }
+
+    def regex_patterns(self, text, metrics=None):
+        patterns = {}
+        for name, _type in self.types.items():
+            start = time.perf_counter()
+            patterns[name] = self.regex_iter(self.regex(_type=_type), text)
+            if metrics:
+                metrics.add_time(f"regex.{_type}", time.perf_counter() - start)
+                metrics.count(f"matches.{name}", len(patterns[name]))
         return patterns
 
 
@@ -63,38 +75,55 @@ def add_values_in_dict(data_dict, key, values):
     return data_dict
 
 
-def main(source):
+def main(source, metrics=None):
+    if metrics is None:
+        metrics = Metrics("ioc_extractor")
     regex = RegexHelper()
-    files = get_files(source, ("*.txt", "*.csv", "*.xml"))
+    with metrics.stage("get_files"):
+        files = get_files(source, ("*.txt", "*.csv", "*.xml"))
     data = {}
 
     if files:
         for filename in files:
-            with open(filename, encoding="utf-8") as txt_file:
+            metrics.count("files")
+            with metrics.stage("scan"), open(filename, encoding="utf-8") as txt_file:
                 for line in txt_file:
-                    for name, regex_type in regex.regex_patterns(line).items():
+                    metrics.count("lines")
+                    for name, regex_type in regex.regex_patterns(line, metrics).items():
                         for pattern in regex_type:
                             add_values_in_dict(data, name, [pattern.lower().replace("[.]", ".").replace(",url,,", "")])
+            # Only counted once the whole file has been read and decoded
+            metrics.count("bytes_read", Path(filename).stat().st_size)
     else:
         sys.exit("[!] Doesn't appear to be any files that exist with .txt, .csv, or .xml extensions.")
 
-    new_dict = {a: list(set(b)) for a, b in data.items()}
-    json_obj = json.dumps(new_dict, indent=4)
+    with metrics.stage("output"):
+        new_dict = {a: list(set(b)) for a, b in data.items()}
+        json_obj = json.dumps(new_dict, indent=4)
 
-    if json_obj and new_dict:
-        data = json.loads(json_obj)
-        for key in data:
-            print(f"\n{key} Count: {len(data[key])}\n==================")
-            for value in data[key]:
-                print(value)
+        if json_obj and new_dict:
+            data = json.loads(json_obj)
+            for key in data:
+                metrics.count(f"unique.{key}", len(data[key]))
+                print(f"\n{key} Count: {len(data[key])}\n==================")
+                for value in data[key]:
+                    print(value)
 
-        with open("data.json", "w", encoding="utf-8") as outfile:
-            json.dump(new_dict, outfile, indent=4)
+            with open("data.json", "w", encoding="utf-8") as outfile:
+                json.dump(new_dict, outfile, indent=4)
 
 
 if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        sys.exit("Usage: python ioc_extractor.py <Directory containing IOCs>")
-    else:
-        arg = sys.argv[1]
-    main(arg)
+    parse = argparse.ArgumentParser(description=__description__)
+    parse.add_argument("source", help="Directory containing IOCs")
+    add_arguments(parse)
+    args = parse.parse_args()
+
+    metrics = Metrics("ioc_extractor", profile=args.profile, trace_memory=args.trace_memory)
+    metrics.start()
+    try:
+        main(args.source, metrics)
+    finally:
+        metrics.stop()
+        if path := metrics_path(args, "ioc_extractor"):
+            metrics.dump(path)
@@ -0,0 +1,116 @@
+"""Per-stage timers, counters, and optional profiling hooks for the scanner scripts."""
+
+import cProfile
+import json
+import pstats
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+
+
+class Metrics:
+    """Collects stage timings and counters for a single run."""
+
+    def __init__(self, name: str, profile: bool = False, trace_memory: bool = False):
+        self.name = name
+        self.timers = {}
+        self.calls = {}
+        self.counters = {}
+        self.profile = cProfile.Profile() if profile else None
+        self.trace_memory = trace_memory
+        self.memory = {}
+        self._start = None
+        self._elapsed = 0.0
+
+    def start(self) -> None:
+        """Start the run clock and any enabled profilers."""
+        if self.trace_memory:
+            tracemalloc.start()
+        if self.profile:
+            self.profile.enable()
+        self._start = time.perf_counter()
+
+    def stop(self) -> None:
+        """Stop the run clock and any enabled profilers."""
+        self._elapsed = time.perf_counter() - self._start
+        if self.profile:
+            self.profile.disable()
+        if self.trace_memory:
+            current, peak = tracemalloc.get_traced_memory()
+            self.memory = {"current_bytes": current, "peak_bytes": peak}
+            tracemalloc.stop()
+
+    def add_time(self, stage: str, seconds: float) -> None:
+        """Add elapsed seconds to a stage timer."""
+        self.timers[stage] = self.timers.get(stage, 0.0) + seconds
+        self.calls[stage] = self.calls.get(stage, 0) + 1
+
+    @contextmanager
+    def stage(self, stage: str):
+        """Time the enclosed block under the given stage name."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(stage, time.perf_counter() - start)
+
+    def count(self, counter: str, value: int = 1) -> None:
+        """Increment a counter."""
+        self.counters[counter] = self.counters.get(counter, 0) + value
+
+    def summary(self) -> dict:
+        """Return the collected metrics as a JSON-serializable dictionary."""
+        elapsed = self._elapsed
+        files = self.counters.get("files", 0)
+        bytes_read = self.counters.get("bytes_read", 0)
+        summary = {
+            "script": self.name,
+            "elapsed_seconds": round(elapsed, 6),
+            "files_per_second": round(files / elapsed, 2) if elapsed else 0.0,
+            "counters": dict(sorted(self.counters.items())),
+            "stages": {
+                stage: {"seconds": round(seconds, 6), "calls": self.calls[stage]}
+                for stage, seconds in sorted(self.timers.items())
+            },
+        }
+        if bytes_read:
+            summary["bytes_per_second"] = round(bytes_read / elapsed, 2) if elapsed else 0.0
+        if self.memory:
+            summary["memory"] = self.memory
+        return summary
+
+    def dump(self, path: str) -> None:
+        """
+        Write the metrics summary to a JSON file. If profiling was enabled, the raw cProfile
+        stats are written next to it with a ".prof" suffix (appended if path already ends in ".prof").
+
+        :param path: The output path for the JSON summary
+        :type path: str
+        """
+        with open(path, "w", encoding="utf-8") as outfile:
+            json.dump(self.summary(), outfile, indent=4)
+        if self.profile:
+            prof_path = Path(path).with_suffix(".prof")
+            if prof_path == Path(path):
+                prof_path = Path(f"{path}.prof")
+            pstats.Stats(self.profile).dump_stats(str(prof_path))
+
+
+def add_arguments(parse) -> None:
+    """Add the shared metrics options to an argparse parser."""
+    parse.add_argument("--metrics", metavar="FILE", help="write a JSON metrics summary to FILE")
+    parse.add_argument("--profile", action="store_true", help="enable cProfile (stats saved next to --metrics)")
+    parse.add_argument("--trace-memory", action="store_true", help="enable tracemalloc peak memory tracking")
+
+
+def metrics_path(args, name: str):
+    """
+    Return the metrics output path from parsed arguments. Profiling flags imply a metrics file,
+    so a default of "<name>_metrics.json" is used when --metrics was not given.
+    """
+    if args.metrics:
+        return args.metrics
+    if args.profile or args.trace_memory:
+        return f"{name}_metrics.json"
+    return None